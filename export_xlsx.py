@@ -0,0 +1,841 @@
+# -*- coding: utf-8 -*-
+import datetime
+import functools
+import glob
+import json
+import os
+import sys
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+from openpyxl import load_workbook
+from openpyxl.utils.cell import get_column_letter
+
+try:
+    # orjson 的 C 实现序列化速度远高于标准库 json，如果已安装则优先使用
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # python-calamine 的 Rust 解析器读取单元格数据比 openpyxl 快得多，
+    # 如果已安装则优先使用
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+"""
+从 Excel 文件导出 JSON 文件
+
+COPYRIGHT 2021 ALL RESERVED. (C) liaoyulei, https://github.com/dualface
+
+github repo: https://github.com/dualface/export-xlsx
+"""
+
+
+class HeaderType:
+    """定义列头的类型
+
+    使用普通整数常量而不是 enum.Enum，避免热循环中
+    Enum.__eq__ 带来的比较开销。
+    """
+    # 正常列头
+    NORMAL = 1
+    # 定义字典开始
+    DICT_OPEN = 2
+    # 定义字典结束
+    DICT_CLOSE = 3
+    # 定义数组开始
+    ARRAY_OPEN = 4
+    # 定义数组结束
+    ARRAY_CLOSE = 5
+
+
+# 执行计划中的条目类型，使用小整数以加快热循环中的比较
+_PLAN_NORMAL = 0
+_PLAN_DICT = 1
+_PLAN_ARRAY = 2
+
+# 诊断信息中使用的列号字母缓存
+_col_letter = functools.lru_cache(maxsize=256)(get_column_letter)
+
+
+def _coordinate(column, row):
+    """构造错误信息中使用的单元格坐标字符串"""
+    return _col_letter(column) + str(row)
+
+
+def _normalize_calamine_val(val):
+    """将 calamine 返回的单元格值规整为与 openpyxl 一致的形式"""
+    if val == "":
+        # calamine 用空字符串表示空单元格
+        return None
+    if type(val) is float and val.is_integer():
+        # calamine 将整数单元格读取为 float
+        return int(val)
+    if type(val) is datetime.date:
+        # calamine 将日期单元格读取为 date，openpyxl 返回 datetime
+        return datetime.datetime(val.year, val.month, val.day)
+    return val
+
+
+class Header:
+    """封装数据表格的单个列头"""
+
+    __slots__ = ("column", "name", "type", "val_type",
+                 "optional", "index_order", "anonymous")
+
+    def __init__(self, column, name, column_type,
+                 val_type="auto", optional=False, anonymous=False):
+        # 所在列
+        self.column = column
+        # 字段名
+        self.name = name
+        # 列头类型
+        self.type = column_type
+        # 列头值类型
+        self.val_type = val_type
+        # 是否是可选列
+        self.optional = optional
+        # 是否是索引
+        self.index_order = 0
+        # 是否是匿名字段
+        self.anonymous = anonymous
+
+
+class DocumentSchema:
+    """规格定义"""
+
+    def __init__(self, configs):
+        for key in ("output", "header_row", "first_data_row"):
+            if key not in configs:
+                raise KeyError(f"Schema(): not found {key} in configs")
+
+        # 输出文件名
+        self.output = configs["output"]
+        # 索引列表
+        if "index" in configs:
+            self.index_names = list(map(str.strip, configs["index"].split(",")))
+            if len(self.index_names) < 1:
+                raise KeyError("must have least one index")
+            if len(self.index_names) > 2:
+                raise KeyError("at most have two indexes")
+        else:
+            self.index_names = list()
+        # 外层对象封装字段
+        if "wrapper_field" in configs:
+            self.wrapper_field = configs["wrapper_field"]
+        else:
+            self.wrapper_field = None
+        # 列头所在行
+        self.header_row = int(configs["header_row"])
+        # 列头所在的列
+        if "header_col" in configs:
+            self.header_col = int(configs["header_col"])
+        else:
+            self.header_col = 1
+        # 数据起始行
+        self.first_data_row = int(configs["first_data_row"])
+
+        # 所有列头 [TableHeader]
+        self.headers = []
+        # 所有的字典定义 dict_name => [TableHeader, TableHeader, ...]
+        self.dicts = dict()
+        # 所有的数组定义 array_name => [TableHeader, TableHeader, ...]
+        self.arrays = dict()
+        # 字段名到列头的映射，同名字段保留第一个
+        self._headers_by_name = dict()
+        # 下一个索引的序号
+        self._next_index_order = 1
+
+        # 添加列头时用于标记最后一个字典列名
+        self._last_dict_name = None
+        # 添加列头时用于标记最后一个数组列名
+        self._last_array_name = None
+
+    def dumps(self):
+        """输出配置信息"""
+        print("Schema:")
+        print(f"    output: {self.output}")
+        if len(self.index_names) > 0:
+            print(f"    indexes: {self.index_names}")
+        if self.wrapper_field is not None:
+            print(f"    wrapper_field: {self.wrapper_field}")
+        print(f"    header_row: {self.header_row}")
+        print(f"    header_col: {self.header_col}")
+        print(f"    first_data_row: {self.first_data_row}")
+
+        indent = ""
+        for header in self.headers:
+            optional = ""
+            if header.optional:
+                optional = " OPTIONAL"
+            if header.type == HeaderType.DICT_OPEN:
+                print(f"column [{header.column:>2}]: {header.name}{optional} DICT {{")
+                indent = "    "
+            elif header.type == HeaderType.DICT_CLOSE:
+                print(f"column [{header.column:>2}]: }}")
+                indent = ""
+            elif header.type == HeaderType.ARRAY_OPEN:
+                print(f"column [{header.column:>2}]: {header.name}{optional} ARRAY [")
+                indent = "    "
+            elif header.type == HeaderType.ARRAY_CLOSE:
+                print(f"column [{header.column:>2}]: ]")
+                indent = ""
+            else:
+                header_val_type = ""
+                if header.val_type != "auto":
+                    header_val_type = f": <{header.val_type}>"
+                print(f"column [{header.column:>2}]: {indent}{header.name}{header_val_type}{optional}")
+        print("")
+
+    def add_header(self, column, name):
+        """添加列头"""
+        name = name.strip().replace(" ", "")
+        anonymous = name[0] == "#"
+        if anonymous:
+            name = name[1:]
+
+        # 查找类型定义
+        val_type = "auto"
+        type_pos = name.find(":")
+        if type_pos > 0:
+            val_type = name[type_pos + 1:]
+            name = name[0:type_pos]
+
+        last_char = name[len(name) - 1]
+        if anonymous and last_char != "[":
+            raise TypeError(f"only array can be anonymous")
+
+        header_type = HeaderType.NORMAL
+
+        if last_char == "{" or last_char == "[":
+            name = name[0:len(name) - 1]
+
+        optional = name[len(name) - 1] == "?"
+        if optional:
+            name = name[0:len(name) - 1]
+
+        if last_char == "{":
+            header_type = HeaderType.DICT_OPEN
+            self._last_dict_name = name
+            self.dicts[name] = []
+        elif last_char == "}":
+            header_type = HeaderType.DICT_CLOSE
+            name = self._last_dict_name
+        elif last_char == "[":
+            header_type = HeaderType.ARRAY_OPEN
+            self._last_array_name = name
+            self.arrays[name] = []
+        elif last_char == "]":
+            header_type = HeaderType.ARRAY_CLOSE
+            name = self._last_array_name
+
+        header = Header(column, name, header_type, val_type=val_type, optional=optional, anonymous=anonymous)
+        if self._last_dict_name is not None:
+            self.dicts[self._last_dict_name].append(header)
+        elif self._last_array_name is not None:
+            self.arrays[self._last_array_name].append(header)
+
+        if last_char == "}":
+            self._last_dict_name = None
+        if last_char == "]":
+            self._last_array_name = None
+
+        self.headers.append(header)
+        self._headers_by_name.setdefault(name, header)
+
+    def add_index(self, index_name):
+        """添加索引"""
+        header = self._headers_by_name.get(index_name)
+        if header is not None:
+            header.index_order = self._next_index_order
+            self._next_index_order = self._next_index_order + 1
+
+
+class ExcelSheet:
+    """封装对 Excel 工作表的操作"""
+
+    def __init__(self, sheet, calamine_wb=None):
+        self.sheet = sheet
+        if calamine_wb is not None:
+            self.grid = self._fetch_cells_calamine(calamine_wb)
+        else:
+            self.grid = self._fetch_cells()
+        # 网格载入后行数就固定了，缓存下来避免循环中反复读取 sheet.max_row
+        self.max_row = len(self.grid)
+        self.schema = DocumentSchema(self._fetch_configs())
+        self._fetch_headers()
+
+    def load_records(self):
+        """载入行
+
+        1. 从 first_data_row, header_col 开始，往右顺序读取字段值。
+        2. 当遇到 DICT_OPEN 或者 ARRAY_OPEN 时，则开始读取 DICT 或 ARRAY 定义的区域。
+        3. 读取区域完成后，从当前行继续往右读取字段值。
+        4. 最后构造包含当前记录所有字段的字典。
+
+        """
+        records = []
+        row = self.schema.first_data_row
+        max_row = self.max_row
+        while row <= max_row:
+            if self._val(self.schema.header_col, row) is None:
+                row = row + 1
+                continue
+            record, row = self._load_record(row)
+            records.append(record)
+        return records
+
+    def make_indexed_records(self, records):
+        """根据索引构建索引后的分组记录集"""
+        index_names = self.schema.index_names
+        if len(index_names) == 1:
+            index_name = index_names[0]
+            return {row[index_name]: row for row in records}
+
+        primary_indexed_rows = dict()
+        primary_index_name = index_names[0]
+        last_index_name = index_names[-1]
+        for row in records:
+            group = primary_indexed_rows.setdefault(row[primary_index_name], dict())
+            group[row[last_index_name]] = row
+
+        return primary_indexed_rows
+
+    # private
+
+    def _val(self, column, row, val_type="auto"):
+        """返回指定单元格的值，如果有必要则转换为数字"""
+        return _convert_val(self.grid[row - 1][column - 1], val_type)
+
+    def _load_record(self, row):
+        """载入一条记录
+
+        1. 从 row 行的第一列开始，往右顺序读取字段值。
+        2. 当遇到 DICT_OPEN 或者 ARRAY_OPEN 时，则开始读取 DICT 或 ARRAY 定义的区域。
+           2.1. 如果是 ARRAY，则区域可能包括多行，以 ARRAY_CLOSE 标记结束区域
+        3. 读取区域完成后，从 row 行继续往右读取字段值。
+        4. 返回包含当前记录所有字段的字典。
+        5. 返回记录字典，以及下一行记录的开始行
+
+        每个工作表实例都会用 _gen_load_record 生成的专用版本
+        覆盖本方法，此处保留通用实现作为行为参考。
+        """
+        record = dict()
+        # 按执行计划读取每一个字段对应的值
+        max_move_row = 1
+        _val = self._val
+        # 行尾连续的空单元格不会产生任何字段，先算出有效行长
+        row_list = self.grid[row - 1]
+        row_len = len(row_list)
+        while row_len > 0 and row_list[row_len - 1] is None:
+            row_len = row_len - 1
+        for kind, name, column, val_type, optional, headers, rest_optional in self._plan:
+            if rest_optional and column > row_len:
+                # 剩余的列头全部可选，而数据行已经结束
+                break
+            if kind == _PLAN_NORMAL:
+                val = _val(column, row, val_type)
+                if (not optional) or (val is not None):
+                    record[name] = val
+            elif kind == _PLAN_DICT:
+                val = self._fetch_dict(headers, row, optional)
+                if (not optional) or len(val) > 0:
+                    record[name] = val
+            else:
+                arr, read_rows_count = self._fetch_array(headers, row, optional)
+                if (not optional) or len(arr) > 0:
+                    record[name] = arr
+                if read_rows_count > max_move_row:
+                    max_move_row = read_rows_count
+
+        return record, row + max_move_row
+
+    def _fetch_dict(self, headers, row, optional):
+        """读取当前行内指定的字典"""
+        len_of_headers = len(headers)
+
+        val = self._val(headers[0].column, row)
+        if val != "{":
+            if optional:
+                return dict()
+            raise TypeError(f"cell at <{_coordinate(headers[0].column, row)}> is not dict begin")
+
+        val = self._val(headers[-1].column, row)
+        if val != "}":
+            raise TypeError(f"cell at <{_coordinate(headers[-1].column, row)}> is not dict end")
+
+        dict_at_row = dict()
+        for i in range(1, len_of_headers - 1):
+            header = headers[i]
+            val = self._val(header.column, row, header.val_type)
+            if val is not None:
+                dict_at_row[header.name] = val
+
+        return dict_at_row
+
+    def _fetch_array(self, headers, row, optional):
+        """从指定行开始读取包含多个字典的数组"""
+        _val = self._val
+
+        val = _val(headers[0].column, row)
+        if val != "{" and val != "[":
+            if optional:
+                return [], 1
+            raise TypeError(f"cell at <{_coordinate(headers[0].column, row)}> is not array begin")
+
+        # 先沿结束列扫描出数组占用的行数，
+        # 之后的取值循环就不用每行再检查结束标记
+        close_column = headers[-1].column
+        max_row = self.max_row
+        read_rows_count = 0
+        data_row = row
+        while data_row <= max_row:
+            read_rows_count = read_rows_count + 1
+            val = _val(close_column, data_row)
+            data_row = data_row + 1
+            if val == "}" or val == "]":
+                # 数组已经结束
+                break
+
+        members = headers[1:len(headers) - 1]
+        arr = []
+        if headers[0].anonymous:
+            for data_row in range(row, row + read_rows_count):
+                for header in members:
+                    val = _val(header.column, data_row, header.val_type)
+                    if val is not None:
+                        arr.append(val)
+        else:
+            for data_row in range(row, row + read_rows_count):
+                dict_at_row = {
+                    header.name: val
+                    for header, val in (
+                        (header, _val(header.column, data_row, header.val_type))
+                        for header in members
+                    )
+                    if val is not None
+                }
+                if len(dict_at_row) > 0:
+                    arr.append(dict_at_row)
+
+        return arr, read_rows_count
+
+    def _find_configs_cell(self):
+        """将表格中第一个非空的单元格视为配置文件所在单元格"""
+        for row_index, row_in_grid in enumerate(self.grid):
+            for col_index, val in enumerate(row_in_grid):
+                if _convert_val(val, "auto") is not None:
+                    return col_index + 1, row_index + 1
+        return None
+
+    def _fetch_configs(self):
+        """从工作表中读取导出配置"""
+        col, row = self._find_configs_cell()
+        if col is None:
+            raise SyntaxError("not found configs")
+        val = self._val(col, row)
+
+        # 导出配置分为多行
+        configs = dict()
+        for line in val.split("\n"):
+            # 每一行一个配置项 config_name: config_value
+            parts = list(map(str.strip, line.split(":")))
+            if len(parts) != 2:
+                raise SyntaxError(f"invalid config line '{line}'")
+            key, val = parts
+            if str.isnumeric(val):
+                configs[key] = int(val)
+            else:
+                configs[key] = val
+        return configs
+
+    def _fetch_headers(self):
+        """从工作表中读取列头信息"""
+        for column in range(self.schema.header_col, self.sheet.max_column + 1):
+            name = self._val(column, self.schema.header_row)
+            if name is None:
+                continue
+            self.schema.add_header(column, name)
+        for index_name in self.schema.index_names:
+            self.schema.add_index(index_name)
+        self._plan = self._make_plan()
+        # 用执行计划生成的专用函数覆盖通用的 _load_record
+        self._load_record = types.MethodType(self._gen_load_record(), self)
+
+    def _make_plan(self):
+        """根据列头信息生成载入记录时的执行计划
+
+        每条记录都要遍历一次列头，提前把跳过逻辑、类型分发和
+        字典/数组定义的查找固化为
+        (kind, name, column, val_type, optional, headers) 元组列表，
+        热循环中只需按整数 kind 分发。
+        """
+        plan = []
+        min_column = 1
+        for header in self.schema.headers:
+            if header.column < min_column:
+                continue
+            if header.type == HeaderType.NORMAL:
+                plan.append((_PLAN_NORMAL, header.name, header.column,
+                             header.val_type, header.optional, None))
+            elif header.type == HeaderType.DICT_OPEN:
+                headers = self.schema.dicts[header.name]
+                plan.append((_PLAN_DICT, header.name, header.column,
+                             header.val_type, header.optional, headers))
+                min_column = headers[-1].column + 1
+            elif header.type == HeaderType.ARRAY_OPEN:
+                headers = self.schema.arrays[header.name]
+                plan.append((_PLAN_ARRAY, header.name, header.column,
+                             header.val_type, header.optional, headers))
+                min_column = headers[-1].column + 1
+
+        # 从后往前标记每个条目之后（含自身）是否全部可选，
+        # 载入记录时据此在数据行的空尾部提前结束扫描
+        rest_optional = True
+        for i in range(len(plan) - 1, -1, -1):
+            rest_optional = rest_optional and plan[i][4]
+            plan[i] = plan[i] + (rest_optional,)
+        return plan
+
+    def _gen_load_record(self):
+        """根据执行计划生成本工作表专用的 _load_record
+
+        列头计划对工作表的所有数据行都相同，把计划直接展开成一段
+        专用代码可以省去逐条目分发的解释开销。生成的函数与通用的
+        _load_record 行为完全一致。
+        """
+        lines = [
+            "def _load_record(self, row):",
+            "    _val = self._val",
+            "    record = {}",
+            "    max_move_row = 1",
+            "    row_list = self.grid[row - 1]",
+            "    row_len = len(row_list)",
+            "    while row_len > 0 and row_list[row_len - 1] is None:",
+            "        row_len = row_len - 1",
+        ]
+        plan = self._plan
+        for i in range(len(plan)):
+            kind, name, column, val_type, optional, headers, rest_optional = plan[i]
+            indent = "    "
+            if rest_optional:
+                # 剩余列头全部可选时，越过有效行长的列直接跳过
+                lines.append(f"    if {column} <= row_len:")
+                indent = "        "
+            if kind == _PLAN_NORMAL:
+                if optional:
+                    lines.append(f"{indent}val = _val({column}, row, {val_type!r})")
+                    lines.append(f"{indent}if val is not None:")
+                    lines.append(f"{indent}    record[{name!r}] = val")
+                else:
+                    lines.append(f"{indent}record[{name!r}] = _val({column}, row, {val_type!r})")
+            elif kind == _PLAN_DICT:
+                lines.append(f"{indent}val = self._fetch_dict(self._plan[{i}][5], row, {optional!r})")
+                if optional:
+                    lines.append(f"{indent}if len(val) > 0:")
+                    lines.append(f"{indent}    record[{name!r}] = val")
+                else:
+                    lines.append(f"{indent}record[{name!r}] = val")
+            else:
+                lines.append(f"{indent}arr, read_rows_count = "
+                             f"self._fetch_array(self._plan[{i}][5], row, {optional!r})")
+                if optional:
+                    lines.append(f"{indent}if len(arr) > 0:")
+                    lines.append(f"{indent}    record[{name!r}] = arr")
+                else:
+                    lines.append(f"{indent}record[{name!r}] = arr")
+                lines.append(f"{indent}if read_rows_count > max_move_row:")
+                lines.append(f"{indent}    max_move_row = read_rows_count")
+        lines.append("    return record, row + max_move_row")
+
+        namespace = dict()
+        exec("\n".join(lines), namespace)
+        return namespace["_load_record"]
+
+    def _fetch_cells(self):
+        """将工作表的所有单元格全部载入内存，方便后续快速查询
+
+        以 list[list] 形式保存所有单元格的值（下标从 0 开始），
+        相比逐个访问 cell 对象，查询更快且内存占用更小。
+        """
+        max_column = self.sheet.max_column
+        grid = []
+        for row in self.sheet.iter_rows(values_only=True):
+            row_in_grid = list(row)
+            if len(row_in_grid) < max_column:
+                row_in_grid.extend([None] * (max_column - len(row_in_grid)))
+            grid.append(row_in_grid)
+        return grid
+
+    def _fetch_cells_calamine(self, calamine_wb):
+        """使用 python-calamine 载入工作表的所有单元格
+
+        与 _fetch_cells 的结果保持一致：list[list] 网格，
+        空单元格为 None（calamine 返回空字符串），
+        整数单元格为 int（calamine 返回 float），
+        短行补齐到 max_column。
+        """
+        max_row = self.sheet.max_row
+        max_column = self.sheet.max_column
+        rows = calamine_wb.get_sheet_by_name(self.sheet.title).to_python(skip_empty_area=False)
+        grid = []
+        for row in rows:
+            row_in_grid = [_normalize_calamine_val(val) for val in row]
+            if len(row_in_grid) < max_column:
+                row_in_grid.extend([None] * (max_column - len(row_in_grid)))
+            grid.append(row_in_grid)
+        while len(grid) < max_row:
+            grid.append([None] * max_column)
+        return grid
+
+
+# 字符串字面量到值的映射，统一转为小写后查表
+_LITERALS = {"null": None, "true": True, "false": False}
+
+
+@functools.lru_cache(maxsize=8192)
+def _convert_str_auto(val):
+    """转换字符串形式的单元格值
+
+    配置标记 "{"、"}" 和数字字符串在表格中大量重复出现，
+    缓存转换结果可以省掉重复的字符串处理。只缓存这个分支：
+    字符串键不会像 1 == True == 1.0 那样互相覆盖缓存槽，
+    标量结果也不会在记录之间共享可变对象。
+    """
+    val = val.strip()
+    val_lower = val.lower()
+    if val_lower in _LITERALS:
+        return _LITERALS[val_lower]
+    if val.isdigit() or (val.startswith("-") and val[1:].isdigit()):
+        return int(val)
+    try:
+        return round(float(val), 4)
+    except ValueError:
+        return val
+
+
+def _convert_val_auto(val):
+    """转换单元格的值"""
+    if val is None:
+        return None
+    # openpyxl 通常已经返回 int/float/bool，直接使用，
+    # 不再绕一圈字符串转换
+    val_type = type(val)
+    if val_type is int or val_type is bool:
+        return val
+    if val_type is float:
+        return round(val, 4)
+    return _convert_str_auto(val if val_type is str else str(val))
+
+
+def _convert_val_vec2(val, is_int=False):
+    sep = ","
+    if val.find("x") != -1:
+        sep = "x"
+    elif val.find(":") != -1:
+        sep = ":"
+
+    parts = list(map(str.strip, val.split(sep)))
+    if len(parts) != 2:
+        raise TypeError(f"val {val} is not vec2")
+
+    if is_int:
+        return {"x": int(parts[0]), "y": int(parts[1])}
+    else:
+        return {"x": float(parts[0]), "y": float(parts[1])}
+
+
+def _convert_val(val, val_type):
+    """转换单元格的值"""
+    if val_type == "auto":
+        return _convert_val_auto(val)
+
+    if val_type == "string":
+        return val
+
+    if val_type == "int":
+        return int(val)
+
+    if val_type == "float":
+        return float(val)
+
+    if val_type == "bool":
+        if val.lower() == "true":
+            return True
+        else:
+            return False
+
+    if val_type == "vec2":
+        return _convert_val_vec2(val)
+    if val_type == "vec2int":
+        return _convert_val_vec2(val, is_int=True)
+
+    raise TypeError(f"unsupported val_type {val_type}")
+
+
+def print_help():
+    print("""
+usage:
+
+    python3 export-xlsx.py [-q] [-i INDEX] FILENAME [MORE_FILES ...]
+    python3 export-xlsx.py [-q] [-i INDEX] *.xlsx
+
+options:
+
+    -q: keep quiet, display less messages
+    -i: gen indexes of all files, save to file name of INDEX
+
+examples:
+
+    # convert specified file
+    python3 export-xlsx.py test.xlsx
+
+    # convert *.xlsx, gen indexes of all files, save to index.json
+    python3 export-xlsx.py -i index.json *.xlsx
+
+""")
+
+
+def load_all_rows_in_workbook(filename, verbose):
+    """打开工作薄，遍历所有工作表，载入数据
+
+    1. 遍历每一个工作表，读取工作表 A1 单元格
+    2. 如果 A1 单元格不为空，则假定为工作表的导出设置
+    3. 读取工作表内定义的列头
+    4. 读取工作表的数据
+    5. 每个工作表读取的数据会以输出文件名为 KEY 放入 all 字典
+    6. 如果多个工作表使用相同的输出文件名，则会合并数据
+    7. 最后返回 all 字典
+    """
+    print(f"load file '{os.path.basename(filename)}'")
+    wb = load_workbook(filename=filename, data_only=True, read_only=True, keep_links=False)
+    calamine_wb = None
+    if CalamineWorkbook is not None:
+        calamine_wb = CalamineWorkbook.from_path(filename)
+
+    # 从工作薄中载入的所有数据
+    # filename => rows_dict
+    all_rows = dict()
+    sheets = dict()
+    for sheet_name in wb.sheetnames:
+        sheet_instance = wb[sheet_name]
+        try:
+            print(f"load sheet {sheet_name}")
+            sheet = ExcelSheet(sheet_instance, calamine_wb)
+            sheets[sheet_name] = sheet
+        except SyntaxError:
+            print(f"[ERROR] not found configs in sheet {sheet_name}")
+            print("")
+            continue
+        if verbose:
+            sheet.schema.dumps()
+        records = sheet.load_records()
+
+        name = sheet.schema.output
+        if len(sheet.schema.index_names) > 0:
+            indexed = sheet.make_indexed_records(records)
+            if name in all_rows:
+                for key in indexed:
+                    all_rows[name][key] = indexed[key]
+            else:
+                all_rows[name] = indexed
+        else:
+            if sheet.schema.wrapper_field is not None:
+                records = {sheet.schema.wrapper_field: records}
+            all_rows[name] = records
+
+    if len(all_rows) == 0:
+        print("skipped.")
+        print("")
+
+    return all_rows
+
+
+def export_all_to_json(all_rows):
+    """导出所有数据为 JSON 文件"""
+    index = []
+    for output in all_rows:
+        print(f"write file '{output}'")
+        if orjson is not None:
+            # OPT_NON_STR_KEYS: 数字索引的记录键与标准库一样转为字符串
+            with open(output, "wb") as f:
+                f.write(orjson.dumps(
+                    all_rows[output],
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            # json.dump 将编码结果分块写入文件，
+            # 避免先在内存中构造出完整的 JSON 字符串
+            with open(output, "w", newline='\n') as f:
+                json.dump(all_rows[output], f, indent=4)
+        index.append(output)
+    return index
+
+
+def export_file(filename, verbose):
+    all_rows = load_all_rows_in_workbook(filename, verbose)
+    return export_all_to_json(all_rows)
+
+
+def export_files(names, verbose):
+    """转换 names 中所有模式匹配到的 Excel 文件
+
+    POSIX 的 shell 会先把 *.xlsx 展开成具体的文件名列表，
+    所以要把所有参数匹配到的文件汇总后再统一分发任务。
+    """
+    filenames = []
+    for name in names:
+        for filename in glob.glob(name):
+            basename = os.path.basename(filename)
+            if basename[0] == "~" or basename[0] == ".":
+                continue
+            filenames.append(filename)
+
+    index = []
+    if len(filenames) <= 1:
+        for filename in filenames:
+            index[len(index):] = export_file(filename, verbose)
+        return index
+
+    # 每个文件都是独立的转换任务，使用多进程并行处理
+    with ProcessPoolExecutor() as executor:
+        worker = functools.partial(export_file, verbose=verbose)
+        for file_index in executor.map(worker, filenames):
+            index[len(index):] = file_index
+    return index
+
+
+def main():
+    if len(sys.argv) < 2:
+        print_help()
+        sys.exit(1)
+    names = sys.argv[1:]
+    if len(names) > 1 and names[0] == "-q":
+        verbose = False
+        names = names[1:]
+    else:
+        verbose = True
+    if len(names) > 2 and names[0] == "-i":
+        index_filename = names[1]
+        names = names[2:]
+    else:
+        index_filename = None
+
+    index = export_files(names, verbose)
+
+    if index_filename is not None:
+        output_index = []
+        for filename in index:
+            if len(filename) > 0:
+                output_index.append(filename)
+
+        with open(index_filename, "w", newline='\n') as f:
+            print(f"write index file '{index_filename}'")
+            f.write(json.dumps(dict({"index": output_index}), indent=4))
+
+    print("done.")
+
+
+if __name__ == "__main__":
+    main()